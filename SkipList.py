@@ -1,10 +1,18 @@
+import math
 import random
-from typing import Optional, Any, List, Tuple
+from operator import itemgetter
+from typing import Optional, Any, Iterable, Iterator, List, Tuple
+
+
+# Sentinel distinguishing "key not found" from a stored None value
+_MISSING = object()
 
 
 class SkipListNode:
     """Node in the skip list containing key-value pair and forward pointers"""
 
+    __slots__ = ('key', 'value', 'forward')
+
     def __init__(self, key: Any, value: Any, level: int):
         self.key = key
         self.value = value
@@ -30,16 +38,91 @@ class SkipList:
         self.max_level = max_level
         self.probability = probability
         self.level = 0  # Current level of skip list
+        self._size = 0  # Number of elements, maintained by insert/delete
+
+        # Create header node; its key is never compared, since traversal only
+        # compares the keys of successor nodes and no forward pointer targets the header
+        self.header = SkipListNode(None, None, max_level)
+
+        # Predecessor buffer reused by insert/delete; slots are written before they are read
+        self._update = [None] * (max_level + 1)
+
+        # Last node at each level (header while the level is empty), for the append fast path
+        self._tail = [self.header] * (max_level + 1)
+
+    @classmethod
+    def build_sorted(cls, pairs: Iterable[Tuple[Any, Any]], max_level: int = 16,
+                     probability: float = 0.5) -> 'SkipList':
+        """
+        Build a skip list from (key, value) pairs in a single linking pass
+
+        Args:
+            pairs: Key-value pairs in any order; for duplicate keys the last value wins
+            max_level: Maximum number of levels in the skip list
+            probability: Probability for promoting nodes to higher levels
 
-        # Create header node with negative infinity key
-        self.header = SkipListNode(float('-inf'), None, max_level)
+        Returns:
+            New skip list containing the pairs
+
+        Time Complexity: O(n log n) to sort (O(n) if already sorted) + O(n) to link
+        """
+        skip_list = cls(max_level, probability)
+
+        # Last node linked at each level; new nodes are appended after it
+        last = [skip_list.header] * (max_level + 1)
+        node = None
+
+        # sorted() is stable, so duplicates stay in input order
+        for key, value in sorted(pairs, key=itemgetter(0)):
+            if node is not None and node.key == key:
+                node.value = value
+                continue
+
+            level = skip_list.random_level()
+            node = SkipListNode(key, value, level)
+            for i in range(level + 1):
+                last[i].forward[i] = node
+                last[i] = node
+
+            if level > skip_list.level:
+                skip_list.level = level
+            skip_list._size += 1
+
+        skip_list._tail = last
+        return skip_list
+
+    def __getstate__(self) -> dict:
+        """Pickle as sorted (key, value) pairs rather than the recursive node chain"""
+        return {
+            'max_level': self.max_level,
+            'probability': self.probability,
+            'items': self.to_list()
+        }
+
+    def __setstate__(self, state: dict) -> None:
+        """Rebuild the skip list from pickled (key, value) pairs"""
+        rebuilt = self.build_sorted(state['items'], state['max_level'], state['probability'])
+        self.__dict__.update(rebuilt.__dict__)
 
     def random_level(self) -> int:
-        """Generate random level for new node based on probability"""
-        level = 0
-        while random.random() < self.probability and level < self.max_level:
-            level += 1
-        return level
+        """
+        Generate random level for new node based on probability
+
+        Draws the geometric level in O(1) instead of flipping one coin per level:
+        P(level >= k) = probability ** k, capped at max_level.
+        """
+        if self.probability == 0.5:
+            # Count trailing zero bits; the guard bit caps the result at max_level
+            bits = random.getrandbits(self.max_level) | (1 << self.max_level)
+            return (bits & -bits).bit_length() - 1
+        if self.probability <= 0.0:
+            return 0
+        if self.probability >= 1.0:
+            return self.max_level
+
+        # Inverse transform sampling; 1 - random() lies in (0, 1] so log() is defined
+        level = int(math.log(1.0 - random.random()) / math.log(self.probability))
+        return min(level, self.max_level)
 
     def search(self, key: Any) -> Optional[Any]:
         """
@@ -51,19 +134,30 @@ class SkipList:
         Returns:
             Value associated with the key, or None if not found
 
-        Time Complexity: O(log n) average case
+        Time Complexity: O(log n) average case, O(1) for keys past the last element
+
+        Takes no lock, so it may run alongside one writer thread: insert() only
+        publishes fully linked nodes and delete() leaves unlinked nodes traversable.
+        A key present for the whole call is always found; a key inserted or deleted
+        concurrently is seen either before or after the change, never in between.
         """
+        last = self._tail[0]
+        if last is not self.header and last.key < key:
+            return None
+
         current = self.header
+        nxt = None
 
         # Start from highest level and work down
         for i in range(self.level, -1, -1):
             # Move forward while key is greater than next node's key
-            while (current.forward[i] is not None and
-                   current.forward[i].key < key):
-                current = current.forward[i]
+            nxt = current.forward[i]
+            while nxt is not None and nxt.key < key:
+                current = nxt
+                nxt = current.forward[i]
 
         # Move to next node at level 0
-        current = current.forward[0]
+        current = nxt
 
         # Check if we found the key
         if current is not None and current.key == key:
@@ -78,19 +172,29 @@ class SkipList:
             key: Key to insert
             value: Value to associate with the key
 
-        Time Complexity: O(log n) average case
+        Time Complexity: O(log n) average case, O(1) expected when appending past the last key
         """
-        update = [None] * (self.max_level + 1)
-        current = self.header
-
-        # Find position to insert by tracking update pointers
-        for i in range(self.level, -1, -1):
-            while (current.forward[i] is not None and
-                   current.forward[i].key < key):
-                current = current.forward[i]
-            update[i] = current
-
-        current = current.forward[0]
+        update = self._update
+        tail = self._tail
+        last = tail[0]
+
+        if last is not self.header and last.key < key:
+            # Appending: the tails are the predecessors on every level
+            update[:self.level + 1] = tail[:self.level + 1]
+            current = None
+        else:
+            current = self.header
+            nxt = None
+
+            # Find position to insert by tracking update pointers
+            for i in range(self.level, -1, -1):
+                nxt = current.forward[i]
+                while nxt is not None and nxt.key < key:
+                    current = nxt
+                    nxt = current.forward[i]
+                update[i] = current
+
+            current = nxt
 
         # If key already exists, update value
         if current is not None and current.key == key:
@@ -109,10 +213,22 @@ class SkipList:
         # Create new node
         new_node = SkipListNode(key, value, new_level)
 
-        # Update forward pointers
+        # Fill in all of the new node's forward pointers before it is reachable
+        forward = new_node.forward
+        for i in range(new_level + 1):
+            forward[i] = update[i].forward[i]
+
+        # Then splice it in bottom-up, so a concurrent search() that reaches it on
+        # any level can already follow it on every lower level. Each splice is one
+        # list item store: atomic under the GIL, and on free-threaded CPython list
+        # stores publish with release ordering while reads are atomic loads, so a
+        # reader that sees new_node also sees the pointers written above it
         for i in range(new_level + 1):
-            new_node.forward[i] = update[i].forward[i]
             update[i].forward[i] = new_node
+            if forward[i] is None:
+                tail[i] = new_node
+
+        self._size += 1
 
     def delete(self, key: Any) -> bool:
         """
@@ -126,61 +242,115 @@ class SkipList:
 
         Time Complexity: O(log n) average case
         """
-        update = [None] * (self.max_level + 1)
+        return self.pop(key, _MISSING) is not _MISSING
+
+    def pop(self, key: Any, default: Any = None) -> Any:
+        """
+        Delete a key from the skip list and return its value
+
+        Lets callers that need the removed value avoid a separate search().
+
+        Args:
+            key: Key to delete
+            default: Value to return if the key is not found
+
+        Returns:
+            Value that was associated with the key, or default if not found
+
+        Time Complexity: O(log n) average case, O(1) for keys past the last element
+        """
+        last = self._tail[0]
+        if last is not self.header and last.key < key:
+            return default
+
+        update = self._update
         current = self.header
+        nxt = None
 
         # Find the node to delete
         for i in range(self.level, -1, -1):
-            while (current.forward[i] is not None and
-                   current.forward[i].key < key):
-                current = current.forward[i]
+            nxt = current.forward[i]
+            while nxt is not None and nxt.key < key:
+                current = nxt
+                nxt = current.forward[i]
             update[i] = current
 
-        current = current.forward[0]
+        current = nxt
 
         # If key found, delete it
         if current is not None and current.key == key:
-            # Update forward pointers
-            for i in range(self.level + 1):
-                if update[i].forward[i] != current:
-                    break
-                update[i].forward[i] = current.forward[i]
+            # Update forward pointers only on the node's own levels; each update[i]
+            # there is its direct predecessor, so no identity check is needed.
+            # Unlink top-down and leave the node's own pointers intact, so a
+            # concurrent search() standing on it can still continue past it
+            forward = current.forward
+            tail = self._tail
+            for i in range(len(forward) - 1, -1, -1):
+                update[i].forward[i] = forward[i]
+                if tail[i] is current:
+                    tail[i] = update[i]
 
             # Update skip list level
             while self.level > 0 and self.header.forward[self.level] is None:
                 self.level -= 1
 
-            return True
-        return False
+            self._size -= 1
+            return current.value
+        return default
+
+    def range(self, lo: Any, hi: Any) -> Iterator[Tuple[Any, Any]]:
+        """
+        Iterate over (key, value) pairs with lo <= key <= hi in key order
+
+        Args:
+            lo: Inclusive lower bound
+            hi: Inclusive upper bound
+
+        Yields:
+            (key, value) tuples in ascending key order
+
+        Time Complexity: O(log n + k) for k results
+        """
+        current = self.header
+        nxt = None
+
+        # One descent to the first key >= lo, then walk level 0
+        for i in range(self.level, -1, -1):
+            nxt = current.forward[i]
+            while nxt is not None and nxt.key < lo:
+                current = nxt
+                nxt = current.forward[i]
+
+        current = nxt
+        while current is not None and current.key <= hi:
+            yield current.key, current.value
+            current = current.forward[0]
 
     def display(self) -> None:
         """Display the skip list structure level by level"""
         print("Skip List Structure:")
         for i in range(self.level, -1, -1):
-            print(f"Level {i}: ", end="")
+            # Build each level in one string instead of printing per node
+            parts = [f"Level {i}: "]
             node = self.header.forward[i]
             while node is not None:
-                print(f"({node.key}, {node.value}) ", end="")
+                parts.append(f"({node.key}, {node.value}) ")
                 node = node.forward[i]
-            print()
+            print("".join(parts))
 
     def to_list(self) -> List[Tuple[Any, Any]]:
         """Convert skip list to a list of (key, value) tuples"""
-        result = []
+        # Presize from the element count and fill by index
+        result = [None] * self._size
         current = self.header.forward[0]
-        while current is not None:
-            result.append((current.key, current.value))
+        for i in range(self._size):
+            result[i] = (current.key, current.value)
             current = current.forward[0]
         return result
 
     def size(self) -> int:
-        """Get the number of elements in the skip list"""
-        count = 0
-        current = self.header.forward[0]
-        while current is not None:
-            count += 1
-            current = current.forward[0]
-        return count
+        """Get the number of elements in the skip list in O(1)"""
+        return self._size
 
 
 # Practical Example: Employee Database Management System
@@ -190,11 +360,27 @@ class EmployeeDatabase:
     Demonstrates practical application in a database-like scenario
     """
 
-    def __init__(self):
+    def __init__(self, employees: Optional[Iterable[Tuple[int, str, str, float]]] = None):
+        """
+        Initialize employee database
+
+        Args:
+            employees: Optional (emp_id, name, department, salary) records to bulk load
+        """
+        records = []
+        salaries = []
+        for emp_id, name, department, salary in employees or ():
+            records.append((emp_id, {
+                'name': name,
+                'department': department,
+                'salary': salary
+            }))
+            salaries.append((salary, emp_id))
+
         # Skip list indexed by employee ID for fast lookups
-        self.employees = SkipList()
+        self.employees = SkipList.build_sorted(records)
         # Secondary index by salary for range queries (simplified example)
-        self.salary_index = SkipList()
+        self.salary_index = SkipList.build_sorted(salaries)
 
     def add_employee(self, emp_id: int, name: str, department: str, salary: float):
         """Add new employee to the database"""
@@ -228,13 +414,26 @@ class EmployeeDatabase:
 
     def remove_employee(self, emp_id: int) -> bool:
         """Remove employee from database"""
-        employee = self.employees.search(emp_id)
-        if employee:
-            # Remove from both indexes
+        employee = self.employees.pop(emp_id)
+        if employee is not None:
+            # Remove from the salary index as well
             self.salary_index.delete(employee['salary'])
-            return self.employees.delete(emp_id)
+            return True
         return False
 
+    def employees_in_salary_range(self, min_salary: float,
+                                  max_salary: float) -> List[Tuple[int, dict]]:
+        """List employees with min_salary <= salary <= max_salary, sorted by salary"""
+        result = []
+        for salary, emp_id in self.salary_index.range(min_salary, max_salary):
+            employee = self.employees.search(emp_id)
+            # The salary index is best-effort (re-added IDs leave stale entries and
+            # employees sharing a salary keep only one), so skip entries that no
+            # longer match the employee record
+            if employee is not None and employee['salary'] == salary:
+                result.append((emp_id, employee))
+        return result
+
     def list_all_employees(self) -> List[Tuple[int, dict]]:
         """List all employees sorted by ID"""
         return self.employees.to_list()
@@ -324,6 +523,11 @@ if __name__ == "__main__":
         print(f"ID: {emp_id:4d} | {emp_data['name']:15s} | "
               f"{emp_data['department']:12s} | ${emp_data['salary']:,}")
 
+    # Range query on the salary index
+    print("\nEmployees earning $60,000 - $100,000 (sorted by salary):")
+    for emp_id, emp_data in db.employees_in_salary_range(60000, 100000):
+        print(f"ID: {emp_id:4d} | {emp_data['name']:15s} | ${emp_data['salary']:,}")
+
     # Remove an employee
     print(f"\nRemoving employee 1008...")
     db.remove_employee(1008)
@@ -335,7 +539,7 @@ if __name__ == "__main__":
     print("\n=== Performance Characteristics ===")
     print("Skip List provides:")
     print("• Average O(log n) search, insert, and delete operations")
-    print("• Ordered traversal in O(n) time")
+    print("• Ordered traversal in O(n) time, range queries in O(log n + k)")
     print("• Space complexity: O(n) on average")
     print("• Probabilistic balancing (no complex rebalancing needed)")
     print("• Excellent for concurrent access (compared to balanced trees)")